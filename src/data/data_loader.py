@@ -5,7 +5,9 @@ import pandas as pd
 import numpy as np
 from sklearn.datasets import load_iris
 from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import StratifiedShuffleSplit, train_test_split
+from sklearn.utils import Bunch
+from functools import lru_cache
 import logging
 from typing import Dict, Any, Tuple, List
 import numpy.typing as npt
@@ -13,6 +15,46 @@ import numpy.typing as npt
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _iris_bunch() -> Bunch:
+    """
+    Load the bundled Iris dataset once per process.
+
+    Features are stored as C-contiguous float32, the dtype scikit-learn trees
+    use internally, so estimators do not cast or copy them on every call. The
+    arrays are shared by every caller, so they are made read-only.
+    """
+    iris = load_iris()
+    iris.data = np.ascontiguousarray(iris.data, dtype=np.float32)
+    iris.data.setflags(write=False)
+    iris.target.setflags(write=False)
+    return iris
+
+
+@lru_cache(maxsize=8)
+def _stratified_split_indices(
+    n_samples: int,
+    test_size: float,
+    random_state: int,
+    y_dtype: str,
+    y_bytes: bytes,
+) -> Tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """
+    Compute (and memoize) stratified train/test indices.
+
+    Produces the same split as ``train_test_split(..., stratify=y)`` for the
+    same ``test_size`` and integer ``random_state``.
+    """
+    y = np.frombuffer(y_bytes, dtype=np.dtype(y_dtype))
+    splitter = StratifiedShuffleSplit(
+        n_splits=1, test_size=test_size, random_state=random_state
+    )
+    train_idx, test_idx = next(splitter.split(np.zeros((n_samples, 1)), y))
+    train_idx.setflags(write=False)
+    test_idx.setflags(write=False)
+    return train_idx, test_idx
+
+
 class DataLoader:
     """Data loading and preprocessing utilities."""
 
@@ -34,17 +76,18 @@ class DataLoader:
         """
         logger.info("Loading Iris dataset...")
 
-        iris = load_iris()
+        iris = _iris_bunch()
 
-        # Store metadata
-        self.feature_names = iris.feature_names
-        self.target_names = iris.target_names
+        # Store metadata (copied, since the cached dataset is shared)
+        self.feature_names = list(iris.feature_names)
+        self.target_names = iris.target_names.copy()
 
         # Create feature matrix and target vector
         X = iris.data
         y = iris.target
 
-        # Optional normalization
+        # Optional normalization (fit_transform returns a new array, so the
+        # cached dataset is never modified)
         if normalize:
             logger.info("Normalizing features...")
             X = self.scaler.fit_transform(X)
@@ -76,6 +119,22 @@ class DataLoader:
         """
         logger.info(f"Splitting data with test_size={test_size}")
 
+        # Deterministic splits of plain arrays with single-label targets reuse
+        # memoized indices; anything else is left to train_test_split
+        if (
+            isinstance(X, np.ndarray)
+            and isinstance(y, np.ndarray)
+            and isinstance(random_state, (int, np.integer))
+            and test_size is not None
+            and y.ndim == 1
+            and len(X) == len(y)
+            and y.dtype.kind in "biufU"
+        ):
+            train_idx, test_idx = _stratified_split_indices(
+                len(y), test_size, int(random_state), y.dtype.str, y.tobytes()
+            )
+            return X[train_idx], X[test_idx], y[train_idx], y[test_idx]
+
         return train_test_split(
             X,
             y,
@@ -84,7 +143,9 @@ class DataLoader:
             stratify=y,  # Ensure balanced split
         )
 
-    def get_data_summary(self, X: Any, y: Any) -> Dict[str, Any]:
+    def get_data_summary(
+        self, X: npt.NDArray[Any], y: npt.NDArray[Any]
+    ) -> Dict[str, Any]:
         """
         Get summary statistics of the dataset.
 
@@ -95,21 +156,36 @@ class DataLoader:
         Returns:
             dict: Summary statistics
         """
-        if not hasattr(X, "shape"):
-            X = np.array(X)
-        if not hasattr(y, "shape"):
-            y = np.array(y)
+        X = np.asarray(X)
+        y = np.asarray(y)
+
+        # Count classes with a single bincount pass for small non-negative
+        # integer labels (its memory grows with the largest label), falling
+        # back to the sort-based np.unique otherwise
+        if (
+            y.dtype.kind in "biu"
+            and y.size
+            and y.min() >= 0
+            and y.max() < 2 * y.size + 1024
+        ):
+            counts = np.bincount(y.astype(np.intp, copy=False))
+            classes = np.flatnonzero(counts)
+            class_counts = counts[classes]
+        else:
+            classes, class_counts = np.unique(y, return_counts=True)
+
+        # Reuse the mean for the standard deviation instead of recomputing it
+        mean = X.mean(axis=0)
+        std = np.sqrt(((X - mean) ** 2).mean(axis=0))
 
         summary = {
             "n_samples": X.shape[0],
             "n_features": X.shape[1] if len(X.shape) > 1 else 1,
-            "n_classes": len(np.unique(y)),
-            "class_distribution": dict(zip(*np.unique(y, return_counts=True))),
+            "n_classes": len(classes),
+            "class_distribution": dict(zip(classes.tolist(), class_counts.tolist())),
             "feature_stats": {
-                "mean": np.mean(X, axis=0).tolist()
-                if len(X.shape) > 1
-                else [np.mean(X)],
-                "std": np.std(X, axis=0).tolist() if len(X.shape) > 1 else [np.std(X)],
+                "mean": np.atleast_1d(mean).tolist(),
+                "std": np.atleast_1d(std).tolist(),
             },
         }
 
@@ -2,18 +2,30 @@
 """
 Local API testing script
 """
-import requests
-import json
-import time
-from pathlib import Path
+import asyncio
+import httpx
 
 API_BASE_URL = "http://localhost:8000"
 
-def test_health():
+async def wait_for_server(client, timeout=30.0):
+    """Poll the health endpoint until the server is ready"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        try:
+            response = await client.get("/health")
+            if response.status_code == 200:
+                return True
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    return False
+
+async def test_health(client):
     """Test health endpoint"""
-    print("🏥 Testing health endpoint...")
     try:
-        response = requests.get(f"{API_BASE_URL}/health")
+        response = await client.get("/health")
+        print("🏥 Testing health endpoint...")
         print(f"Status: {response.status_code}")
         print(f"Response: {response.json()}")
         return response.status_code == 200
@@ -21,10 +33,8 @@ def test_health():
         print(f"❌ Health check failed: {e}")
         return False
 
-def test_single_prediction():
+async def test_single_prediction(client):
     """Test single prediction endpoint"""
-    print("\n🔮 Testing single prediction...")
-
     test_data = {
         "sepal_length": 5.1,
         "sepal_width": 3.5,
@@ -33,12 +43,9 @@ def test_single_prediction():
     }
 
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/predict",
-            json=test_data,
-            headers={"Content-Type": "application/json"}
-        )
+        response = await client.post("/predict", json=test_data)
 
+        print("\n🔮 Testing single prediction...")
         print(f"Status: {response.status_code}")
         result = response.json()
         print(f"Prediction: {result['prediction']}")
@@ -50,10 +57,8 @@ def test_single_prediction():
         print(f"❌ Single prediction failed: {e}")
         return False
 
-def test_batch_prediction():
+async def test_batch_prediction(client):
     """Test batch prediction endpoint"""
-    print("\n📦 Testing batch prediction...")
-
     batch_data = {
         "samples": [
             {"sepal_length": 5.1, "sepal_width": 3.5, "petal_length": 1.4, "petal_width": 0.2},
@@ -63,12 +68,9 @@ def test_batch_prediction():
     }
 
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/predict/batch",
-            json=batch_data,
-            headers={"Content-Type": "application/json"}
-        )
+        response = await client.post("/predict/batch", json=batch_data)
 
+        print("\n📦 Testing batch prediction...")
         print(f"Status: {response.status_code}")
         result = response.json()
         print(f"Batch size: {result['batch_size']}")
@@ -81,12 +83,11 @@ def test_batch_prediction():
         print(f"❌ Batch prediction failed: {e}")
         return False
 
-def test_model_info():
+async def test_model_info(client):
     """Test model info endpoint"""
-    print("\n📊 Testing model info endpoint...")
-
     try:
-        response = requests.get(f"{API_BASE_URL}/model/info")
+        response = await client.get("/model/info")
+        print("\n📊 Testing model info endpoint...")
         print(f"Status: {response.status_code}")
         result = response.json()
         print(f"Model type: {result['model_type']}")
@@ -98,15 +99,11 @@ def test_model_info():
         print(f"❌ Model info failed: {e}")
         return False
 
-def main():
+async def main():
     """Run all API tests"""
     print("🚀 Starting API Tests")
     print("=" * 50)
 
-    # Wait a bit for server to start
-    print("⏳ Waiting for server to be ready...")
-    time.sleep(2)
-
     tests = [
         test_health,
         test_model_info,
@@ -114,13 +111,19 @@ def main():
         test_batch_prediction
     ]
 
-    passed = 0
-    total = len(tests)
+    # Reuse pooled keep-alive connections across all requests
+    limits = httpx.Limits(max_keepalive_connections=10, max_connections=20)
+    async with httpx.AsyncClient(base_url=API_BASE_URL, limits=limits, timeout=5.0) as client:
+        print("⏳ Waiting for server to be ready...")
+        if not await wait_for_server(client):
+            print("❌ Server did not become ready in time.")
+            return False
+
+        # Tests are independent, so run them concurrently
+        results = await asyncio.gather(*(test(client) for test in tests))
 
-    for test in tests:
-        if test():
-            passed += 1
-        time.sleep(1)
+    passed = sum(results)
+    total = len(tests)
 
     print(f"\n{'='*50}")
     print(f"📈 Results: {passed}/{total} tests passed")
@@ -135,4 +138,4 @@ def main():
     return passed == total
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
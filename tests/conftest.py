@@ -1,15 +1,19 @@
-"""Pytest configuration for mlopsdemo tests."""
-import sys
-from pathlib import Path
+"""Pytest configuration for mlopsdemo tests.
 
-# Add project root and src directory to Python path for module imports
-project_root = Path(__file__).parent.parent
-src_path = project_root / "src"
+The project root is put on ``sys.path`` by ``pythonpath`` in pyproject.toml,
+so tests import modules through the single canonical ``src.`` package path.
+"""
+import pytest
 
-# Add project root first (so "src" can be found as a package)
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
 
-# Add src directory (for direct imports like "from src.models...")
-if str(src_path) not in sys.path:
-    sys.path.insert(0, str(src_path))
+@pytest.fixture(scope="session")
+def trained_iris():
+    """Train one IrisModel on the full dataset, shared by the whole session."""
+    from src.models.iris_model import IrisModel
+
+    model = IrisModel(random_state=42)
+    data = model.load_data()
+    X = data.drop("target", axis=1)
+    y = data["target"]
+    model.train(X, y)
+    return model, X, y
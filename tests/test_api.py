@@ -0,0 +1,240 @@
+"""
+Unit tests for the prediction API.
+"""
+import asyncio
+import importlib
+import os
+import sys
+
+import httpx
+import joblib
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.ensemble import RandomForestClassifier
+
+from src.data.data_loader import DataLoader
+
+SAMPLES = [
+    [5.1, 3.5, 1.4, 0.2],
+    [7.0, 3.2, 4.7, 1.4],
+    [6.3, 3.3, 6.0, 2.5],
+    [5.9, 3.0, 5.1, 1.8],
+]
+FEATURES = ["sepal_length", "sepal_width", "petal_length", "petal_width"]
+
+
+def as_features(row):
+    """Convert a feature row to the /predict request body."""
+    return dict(zip(FEATURES, row))
+
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory):
+    """Train a model and save it where the API looks for it."""
+    model_dir = tmp_path_factory.mktemp("api")
+    (model_dir / "models").mkdir()
+
+    data = DataLoader().load_iris_data()
+    model = RandomForestClassifier(n_estimators=20, random_state=42)
+    model.fit(data["features"], data["target"])
+    joblib.dump(model, model_dir / "models" / "iris_model.joblib")
+
+    return model_dir
+
+
+@pytest.fixture(scope="module")
+def app_module(model_dir):
+    """Import the API, which loads the model from model_dir at import time."""
+    cwd = os.getcwd()
+    os.chdir(model_dir)
+    try:
+        module = importlib.import_module("src.api.app")
+    finally:
+        os.chdir(cwd)
+    yield module
+    module.get_model.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def client(app_module):
+    """Serve the API with the model from model_dir."""
+    with TestClient(app_module.app) as client:
+        yield client
+
+
+class TestPredictProba:
+    """Test cases for the model backend."""
+
+    def test_treelite_matches_sklearn(self, app_module, client):
+        """Test the compiled treelite model matches scikit-learn."""
+        pytest.importorskip("treelite")
+
+        model = app_module.get_model()
+        predict_proba = app_module.get_predict_proba()
+        assert predict_proba != model.predict_proba
+
+        X = np.random.RandomState(0).uniform(0, 8, (50, 4)).astype(np.float32)
+        np.testing.assert_allclose(predict_proba(X), model.predict_proba(X), atol=1e-6)
+
+
+class TestModelLoading:
+    """Test cases for loading the model."""
+
+    def test_load_failure_is_not_cached(
+        self, app_module, model_dir, tmp_path, monkeypatch
+    ):
+        """Test a failed load raises and the next call retries it."""
+        # No serialized model in tmp_path, and no way to train one
+        monkeypatch.setitem(sys.modules, "src.models.iris_model", None)
+        monkeypatch.chdir(tmp_path)
+        app_module.get_model.cache_clear()
+
+        with pytest.raises(RuntimeError):
+            app_module.get_model()
+
+        monkeypatch.chdir(model_dir)
+        assert hasattr(app_module.get_model(), "predict_proba")
+
+
+class TestPredict:
+    """Test cases for the single prediction endpoint."""
+
+    def test_predict_matches_model(self, app_module, client):
+        """Test /predict returns the model's probabilities and argmax."""
+        model = app_module.get_model()
+
+        for row in SAMPLES:
+            response = client.post("/predict", json=as_features(row))
+            assert response.status_code == 200
+            result = response.json()
+
+            expected = model.predict_proba(np.array([row]))[0]
+            np.testing.assert_allclose(
+                list(result["probabilities"].values()), expected, atol=1e-6
+            )
+            assert result["prediction_id"] == int(expected.argmax())
+            assert (
+                result["prediction"] == app_module.target_names[result["prediction_id"]]
+            )
+            assert result["confidence"] == pytest.approx(expected.max())
+
+    def test_predict_concurrent(self, app_module, client, monkeypatch):
+        """Test concurrent calls are batched and identical calls share work."""
+        predict_proba = app_module.get_predict_proba()
+        batch_sizes = []
+
+        def counting_predict_proba(X):
+            batch_sizes.append(len(X))
+            return predict_proba(X)
+
+        monkeypatch.setattr(
+            app_module, "get_predict_proba", lambda: counting_predict_proba
+        )
+
+        rows = [[4.0 + i * 0.05, 3.0, 1.0 + i * 0.1, 0.5] for i in range(40)]
+        requests = rows + rows[:10]
+
+        async def post_all():
+            transport = httpx.ASGITransport(app=app_module.app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as async_client:
+                return await asyncio.gather(
+                    *(
+                        async_client.post("/predict", json=as_features(r))
+                        for r in requests
+                    )
+                )
+
+        responses = asyncio.run(post_all())
+
+        assert all(response.status_code == 200 for response in responses)
+        # Every distinct row is predicted exactly once, in fewer model calls
+        assert sum(batch_sizes) == len(rows)
+        assert len(batch_sizes) < len(rows)
+
+        results = [response.json() for response in responses]
+        assert results[len(rows) :] == results[:10]
+
+    def test_predict_failure_is_not_cached(self, app_module, client, monkeypatch):
+        """Test a failed model call is retried by the next identical request."""
+        row = [6.5, 2.5, 4.5, 1.5]
+
+        def failing_predict_proba(X):
+            raise ValueError("model error")
+
+        with monkeypatch.context() as m:
+            m.setattr(app_module, "get_predict_proba", lambda: failing_predict_proba)
+            response = client.post("/predict", json=as_features(row))
+        assert response.status_code == 500
+        assert app_module._inflight == {}
+
+        response = client.post("/predict", json=as_features(row))
+        assert response.status_code == 200
+
+    def test_predict_without_startup_event(self, app_module):
+        """Test /predict works when the app's startup hooks never ran."""
+        client = TestClient(app_module.app)
+        response = client.post("/predict", json=as_features(SAMPLES[0]))
+
+        assert response.status_code == 200
+        assert response.json()["prediction"] == "setosa"
+
+
+class TestPredictBatch:
+    """Test cases for the batch prediction endpoints."""
+
+    def test_predict_batch_matches_batch_fast(self, client):
+        """Test both batch endpoints return the same predictions."""
+        batch = client.post(
+            "/predict/batch", json={"samples": [as_features(r) for r in SAMPLES]}
+        )
+        batch_fast = client.post("/predict/batch_fast", json={"samples": SAMPLES})
+
+        assert batch.status_code == 200
+        assert batch_fast.status_code == 200
+        assert batch.json() == batch_fast.json()
+        assert batch.json()["batch_size"] == len(SAMPLES)
+
+    def test_predict_batch_fast_rejects_short_row(self, client):
+        """Test feature rows must have exactly four values."""
+        response = client.post(
+            "/predict/batch_fast", json={"samples": [[5.1, 3.5, 1.4]]}
+        )
+
+        assert response.status_code == 422
+
+    def test_predict_batch_empty(self, client):
+        """Test an empty batch returns no predictions."""
+        response = client.post("/predict/batch", json={"samples": []})
+
+        assert response.status_code == 200
+        assert response.json() == {"predictions": [], "batch_size": 0}
+
+    def test_predict_batch_fast_empty(self, client):
+        """Test an empty feature-row batch returns no predictions."""
+        response = client.post("/predict/batch_fast", json={"samples": []})
+
+        assert response.status_code == 200
+        assert response.json() == {"predictions": [], "batch_size": 0}
+
+
+class TestConditionalRequests:
+    """Test cases for ETag handling on static endpoints."""
+
+    @pytest.mark.parametrize("path", ["/health", "/model/info"])
+    def test_not_modified(self, app_module, client, path):
+        """Test a matching If-None-Match returns 304 without a body."""
+        response = client.get(path)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert response.headers["cache-control"] == app_module.CACHE_CONTROL
+
+        response = client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+        response = client.get(path, headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
@@ -25,6 +25,8 @@ class TestDataLoader:
 
         # Check dimensions
         assert data["features"].shape == (150, 4)
+        assert data["features"].dtype == np.float32
+        assert data["features"].flags.c_contiguous
         assert data["target"].shape == (150,)
         assert len(data["feature_names"]) == 4
         assert len(data["target_names"]) == 3
@@ -32,6 +34,26 @@ class TestDataLoader:
         # Check normalization flag
         assert data["normalized"] == False
 
+    def test_load_iris_data_cached(self):
+        """Test repeated loads share the read-only cached dataset."""
+        first = self.loader.load_iris_data()
+        second = DataLoader().load_iris_data()
+
+        assert first["features"] is second["features"]
+        assert not first["features"].flags.writeable
+
+        # Mutating returned metadata must not leak into later loads
+        first["feature_names"].append("extra")
+        first["target_names"][0] = "changed"
+        third = DataLoader().load_iris_data()
+        assert len(third["feature_names"]) == 4
+        assert third["target_names"][0] == "setosa"
+
+        # Normalizing must not modify the cached features
+        original = first["features"].copy()
+        DataLoader().load_iris_data(normalize=True)
+        np.testing.assert_array_equal(first["features"], original)
+
     def test_load_iris_data_normalized(self):
         """Test Iris data loading with normalization."""
         data = self.loader.load_iris_data(normalize=True)
@@ -41,8 +63,9 @@ class TestDataLoader:
         means = np.mean(features, axis=0)
         stds = np.std(features, axis=0)
 
-        np.testing.assert_array_almost_equal(means, [0, 0, 0, 0], decimal=10)
-        np.testing.assert_array_almost_equal(stds, [1, 1, 1, 1], decimal=10)
+        # Features are float32, so compare at single precision
+        np.testing.assert_array_almost_equal(means, [0, 0, 0, 0], decimal=6)
+        np.testing.assert_array_almost_equal(stds, [1, 1, 1, 1], decimal=6)
 
         # Check normalization flag
         assert data["normalized"] == True
@@ -66,6 +89,49 @@ class TestDataLoader:
         assert X_train.shape[1] == X.shape[1]
         assert X_test.shape[1] == X.shape[1]
 
+    def test_split_data_matches_train_test_split(self):
+        """Test memoized splits match sklearn's stratified train_test_split."""
+        from sklearn.model_selection import train_test_split
+
+        X = np.random.rand(100, 4)
+        y = np.random.randint(0, 3, 100)
+
+        expected = train_test_split(X, y, test_size=0.3, random_state=7, stratify=y)
+        for _ in range(2):
+            result = self.loader.split_data(X, y, test_size=0.3, random_state=7)
+            for actual, wanted in zip(result, expected):
+                np.testing.assert_array_equal(actual, wanted)
+
+    def test_split_data_multilabel_target(self):
+        """Test splitting with a 2-D target matches train_test_split."""
+        from sklearn.model_selection import train_test_split
+
+        X = np.random.rand(60, 4)
+        y = np.tile([[0, 1], [1, 0], [1, 1]], (20, 1))
+
+        expected = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+        result = self.loader.split_data(X, y, test_size=0.2)
+        for actual, wanted in zip(result, expected):
+            np.testing.assert_array_equal(actual, wanted)
+
+    def test_split_data_inconsistent_lengths(self):
+        """Test X and y of different lengths are rejected."""
+        X = np.random.rand(80, 2)
+        y = np.random.randint(0, 3, 60)
+
+        with pytest.raises(ValueError):
+            self.loader.split_data(X, y)
+
+    def test_split_data_default_test_size(self):
+        """Test test_size=None uses train_test_split's default of 25%."""
+        X = np.random.rand(100, 4)
+        y = np.tile([0, 1], 50)
+
+        X_train, X_test, y_train, y_test = self.loader.split_data(X, y, test_size=None)
+
+        assert X_test.shape[0] == 25
+        assert y_train.shape[0] == 75
+
     def test_get_data_summary(self):
         """Test data summary generation."""
         # Create sample data
@@ -90,6 +156,29 @@ class TestDataLoader:
         # Check feature stats
         expected_means = [3.0, 4.0]  # Mean of [1,3,5] and [2,4,6]
         assert summary["feature_stats"]["mean"] == expected_means
+        np.testing.assert_array_almost_equal(
+            summary["feature_stats"]["std"], np.std(X, axis=0)
+        )
+
+    def test_get_data_summary_sparse_labels(self):
+        """Test data summary with large, sparse integer class labels."""
+        X = np.array([[1.0], [2.0], [3.0]])
+        y = np.array([0, 5, 300_000_000])
+
+        summary = self.loader.get_data_summary(X, y)
+
+        assert summary["n_classes"] == 3
+        assert summary["class_distribution"] == {0: 1, 5: 1, 300_000_000: 1}
+
+    def test_get_data_summary_string_labels(self):
+        """Test data summary with non-integer class labels."""
+        X = np.array([[1.0], [2.0], [3.0]])
+        y = np.array(["setosa", "virginica", "setosa"])
+
+        summary = self.loader.get_data_summary(X, y)
+
+        assert summary["n_classes"] == 2
+        assert summary["class_distribution"] == {"setosa": 2, "virginica": 1}
 
 
 class TestPrepareDataPipeline:
@@ -40,19 +40,13 @@ class TestIrisModel:
         assert len(self.model.feature_names) == 4
         assert len(self.model.target_names) == 3
 
-    def test_train_and_predict(self):
+    def test_train_and_predict(self, trained_iris):
         """Test model training and prediction."""
-        # Load data
-        data = self.model.load_data()
-        X = data.drop("target", axis=1)
-        y = data["target"]
-
-        # Train model
-        self.model.train(X, y)
+        model, X, y = trained_iris
 
         # Make predictions
-        predictions = self.model.predict(X)
-        probabilities = self.model.predict_proba(X)
+        predictions = model.predict(X)
+        probabilities = model.predict_proba(X)
 
         # Check predictions
         assert len(predictions) == len(y)
@@ -62,18 +56,12 @@ class TestIrisModel:
         assert probabilities.shape == (len(y), 3)  # 3 classes
         assert np.allclose(probabilities.sum(axis=1), 1.0)  # Probabilities sum to 1
 
-    def test_evaluate(self):
+    def test_evaluate(self, trained_iris):
         """Test model evaluation."""
-        # Load and prepare data
-        data = self.model.load_data()
-        X = data.drop("target", axis=1)
-        y = data["target"]
-
-        # Train model
-        self.model.train(X, y)
+        model, X, y = trained_iris
 
         # Evaluate
-        metrics = self.model.evaluate(X, y)
+        metrics = model.evaluate(X, y)
 
         # Check metrics structure
         assert "accuracy" in metrics
@@ -84,21 +72,17 @@ class TestIrisModel:
         assert 0.0 <= metrics["accuracy"] <= 1.0
         assert metrics["accuracy"] > 0.8  # Should be high on training data
 
-    def test_save_and_load_model(self):
+    def test_save_and_load_model(self, trained_iris):
         """Test model saving and loading."""
-        # Train a model
-        data = self.model.load_data()
-        X = data.drop("target", axis=1)
-        y = data["target"]
-        self.model.train(X, y)
+        model, X, _ = trained_iris
 
         # Get predictions before saving
-        predictions_before = self.model.predict(X)
+        predictions_before = model.predict(X)
 
         # Save model to temporary file
         with tempfile.TemporaryDirectory() as temp_dir:
             model_path = os.path.join(temp_dir, "test_model.joblib")
-            self.model.save_model(model_path)
+            model.save_model(model_path)
 
             # Check file was created
             assert Path(model_path).exists()